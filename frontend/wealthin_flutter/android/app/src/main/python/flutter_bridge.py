@@ -4,14 +4,21 @@
 
 import json
 from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import re
 from datetime import datetime, timedelta
 import math
+import statistics
 import urllib.request
 import urllib.error
 import ssl
 import base64
+import hashlib
 import os
+import random
+import threading
+import time
 import urllib.parse
 
 
@@ -79,6 +86,21 @@ def set_config(config_json: str) -> str:
         return json.dumps({"success": False, "error": str(e)})
 
 
+_HAS_PYPDF: Optional[bool] = None  # probed on first health check, then fixed
+
+
+def _pypdf_available() -> bool:
+    """Whether pypdf can be imported; the installed packages never change at runtime."""
+    global _HAS_PYPDF
+    if _HAS_PYPDF is None:
+        try:
+            import pypdf  # noqa: F401
+            _HAS_PYPDF = True
+        except ImportError:
+            _HAS_PYPDF = False
+    return _HAS_PYPDF
+
+
 def health_check() -> str:
     """
     Check the health of the Python environment.
@@ -95,11 +117,10 @@ def health_check() -> str:
     }
     
     # Check if PDF parser is available
-    try:
-        from pypdf import PdfReader
+    if _pypdf_available():
         components["pdf_parser_available"] = True
         components["pdf_engine"] = "pypdf"
-    except ImportError:
+    else:
         components["pdf_engine"] = "none"
     
     return json.dumps({
@@ -111,6 +132,57 @@ def health_check() -> str:
     })
 
 
+# ==================== HTTP HELPERS ====================
+
+# One SSL context for all outbound HTTPS: building a default context loads the
+# CA bundle, which is wasted work per request (verification is disabled anyway)
+_SSL_CONTEXT = ssl.create_default_context()
+_SSL_CONTEXT.check_hostname = False
+_SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+
+_RETRYABLE_HTTP_CODES = frozenset([429, 500, 502, 503, 504])
+_CIRCUIT_FAIL_MAX = 5  # consecutive failures before an endpoint is skipped
+_CIRCUIT_RESET_SECONDS = 30
+_circuit_state: Dict[str, list] = {}  # endpoint -> [consecutive_failures, open_until]
+
+
+def _urlopen_with_retry(req: urllib.request.Request, timeout: int, context: ssl.SSLContext,
+                        endpoint: str, attempts: int = 3, base_delay: float = 0.5) -> bytes:
+    """
+    Open `req` and return the response body, retrying transient failures
+    (429/5xx, connection errors, timeouts) with jittered exponential backoff.
+    After repeated failures the endpoint's circuit opens and calls fail fast
+    until the reset window passes. Raises the last error on failure.
+    """
+    state = _circuit_state.setdefault(endpoint, [0, 0.0])
+    if state[1] > time.time():
+        raise urllib.error.URLError(f"{endpoint} temporarily unavailable (circuit open)")
+    
+    for attempt in range(attempts):
+        try:
+            with urllib.request.urlopen(req, timeout=timeout, context=context) as resp:
+                body = resp.read()
+            state[0] = 0
+            return body
+        except urllib.error.HTTPError as e:
+            if e.code not in _RETRYABLE_HTTP_CODES:
+                raise  # Client errors are not upstream failures
+            last_error = e
+        except OSError as e:  # URLError, socket timeouts, connection resets
+            last_error = e
+        
+        state[0] += 1
+        if state[0] >= _CIRCUIT_FAIL_MAX:
+            state[1] = time.time() + _CIRCUIT_RESET_SECONDS
+            print(f"[HTTP] {endpoint} circuit open for {_CIRCUIT_RESET_SECONDS}s")
+            break
+        if attempt < attempts - 1:
+            delay = base_delay * (2 ** attempt)
+            time.sleep(delay + random.uniform(0, delay))
+    
+    raise last_error
+
+
 # ==================== AI-POWERED ANALYSIS ====================
 
 def generate_ai_analysis(financial_data_json: str) -> str:
@@ -209,7 +281,7 @@ IMPORTANT: Use ONLY the data provided. Never make up numbers. Be encouraging and
         ]
         
         # Use Sarvam AI for analysis
-        result = _call_sarvam_llm(messages, _sarvam_api_key) if _sarvam_api_key else None
+        result = _call_sarvam_llm(messages, _sarvam_api_key, cacheable=True) if _sarvam_api_key else None
         
         if result and result.get('content'):
             return json.dumps({
@@ -574,6 +646,9 @@ AVAILABLE_TOOLS = [
     }
 ]
 
+# Tool listing injected into the system prompts; the registry is static
+_TOOL_LIST_TEXT = "\n".join(f"- **{t['name']}**: {t['description']}" for t in AVAILABLE_TOOLS)
+
 # Agentic Actions Storage (for confirmation flow)
 _pending_actions = {}
 
@@ -581,21 +656,19 @@ _pending_actions = {}
 
 # ==================== TOOL EXECUTOR ====================
 
-def execute_tool(tool_name: str, args_json: str) -> str:
-    """
-    Execute a tool by name with given arguments.
-    This is the main entry point for the LLM to call tools.
-    
-    NOTE: args_json is passed as a JSON string from Kotlin, we need to parse it.
-    """
-    try:
-        # Parse the JSON string to a dict
-        if isinstance(args_json, str):
-            args = json.loads(args_json)
-        else:
-            args = args_json  # Already a dict
-        
-        tool_functions = {
+# Search tools are all routed to the unified web search
+_SEARCH_TOOLS = frozenset([
+    "web_search", "search_shopping", "search_news", "search_amazon",
+    "search_flipkart", "search_myntra", "search_hotels", "search_maps",
+])
+_tool_functions: Optional[Dict[str, Any]] = None
+
+
+def _get_tool_functions() -> Dict[str, Any]:
+    """Build the tool name -> function registry once (tools are defined further down)."""
+    global _tool_functions
+    if _tool_functions is None:
+        _tool_functions = {
             "calculate_sip": calculate_sip_maturity,
             "calculate_emi": calculate_emi,
             "calculate_compound_interest": calculate_compound_interest,
@@ -643,14 +716,29 @@ def execute_tool(tool_name: str, args_json: str) -> str:
             "search_jobs": search_jobs,
             "get_career_advice": get_career_advice,
         }
+    return _tool_functions
+
+
+def execute_tool(tool_name: str, args_json: str) -> str:
+    """
+    Execute a tool by name with given arguments.
+    This is the main entry point for the LLM to call tools.
+    
+    NOTE: args_json is passed as a JSON string from Kotlin, we need to parse it.
+    """
+    try:
+        # Parse the JSON string to a dict
+        if isinstance(args_json, str):
+            args = json.loads(args_json)
+        else:
+            args = args_json  # Already a dict
         
         # Route ALL search-related tools to unified web_search
-        search_tools = ["web_search", "search_shopping", "search_news", "search_amazon", 
-                       "search_flipkart", "search_myntra", "search_hotels", "search_maps"]
-        if tool_name in search_tools:
+        if tool_name in _SEARCH_TOOLS:
             query = args.get("query", "")
             return execute_web_search(query)
         
+        tool_functions = _get_tool_functions()
         if tool_name not in tool_functions:
             return json.dumps({
                 "success": False,
@@ -814,7 +902,6 @@ def detect_subscriptions(transactions: List[Dict]) -> str:
     Returns:
         JSON with detected subscriptions and recurring habits
     """
-    import statistics
     from collections import defaultdict
     
     if not transactions or len(transactions) < 2:
@@ -933,21 +1020,31 @@ def get_career_advice(current_role: str, target_role: str, industry: str, query_
         )
 
 
+# Digits and punctuation (incl. the * / # reference markers) in one pass
+_MERCHANT_STRIP_RE = re.compile(r'[^\w\s]|\d')
+
+
 def _normalize_merchant_for_subscription(name: str) -> str:
     """Clean merchant name for grouping."""
     if not name:
         return "unknown"
-    cleaned = re.sub(r'[*#\d]+', '', name.lower())
-    cleaned = re.sub(r'[^\w\s]', '', cleaned)
+    cleaned = _MERCHANT_STRIP_RE.sub('', name.lower())
     for suffix in ['.com', 'com', 'inc', 'ltd', 'pvt', 'private', 'limited']:
         cleaned = cleaned.replace(suffix, '')
     return cleaned.strip() or "unknown"
 
 
+def _mean_and_stdev(values: List[float]) -> tuple:
+    """Float mean and sample standard deviation (0 for a single value)."""
+    mean = statistics.fmean(values)
+    n = len(values)
+    if n < 2:
+        return mean, 0.0
+    return mean, math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1))
+
+
 def _analyze_subscription_pattern(transactions: List[Dict]) -> Dict:
     """Analyze transactions to detect subscription patterns."""
-    import statistics
-    
     amounts = [tx['amount'] for tx in transactions]
     dates = []
     for tx in transactions:
@@ -967,12 +1064,10 @@ def _analyze_subscription_pattern(transactions: List[Dict]) -> Dict:
     
     # Time delta analysis
     deltas = [(dates[i+1] - dates[i]).days for i in range(len(dates)-1)]
-    avg_delta = statistics.mean(deltas)
-    delta_sd = statistics.stdev(deltas) if len(deltas) > 1 else 0
+    avg_delta, delta_sd = _mean_and_stdev(deltas)
     
     # Amount analysis
-    avg_amount = statistics.mean(amounts)
-    amount_sd = statistics.stdev(amounts) if len(amounts) > 1 else 0
+    avg_amount, amount_sd = _mean_and_stdev(amounts)
     amount_cv = (amount_sd / avg_amount) if avg_amount > 0 else 0
     
     # Determine frequency
@@ -1014,13 +1109,15 @@ def _analyze_subscription_pattern(transactions: List[Dict]) -> Dict:
     }
 
 
+_MONTHLY_MULTIPLIERS = {
+    'weekly': 4.33, 'bi-weekly': 2.17, 'monthly': 1.0,
+    'quarterly': 0.33, 'irregular': 1.0
+}
+
+
 def _normalize_amount_to_monthly(amount: float, frequency: str) -> float:
     """Convert amount to monthly equivalent."""
-    multipliers = {
-        'weekly': 4.33, 'bi-weekly': 2.17, 'monthly': 1.0,
-        'quarterly': 0.33, 'irregular': 1.0
-    }
-    return amount * multipliers.get(frequency, 1.0)
+    return amount * _MONTHLY_MULTIPLIERS.get(frequency, 1.0)
 
 
 # ==================== MSME COMPLIANCE & FINANCIAL TOOLS ====================
@@ -1320,6 +1417,15 @@ SOCRATIC_TEMPLATES = {
     ],
 }
 
+SOCRATIC_HINTS = {
+    "clarification": ["Be specific with numbers and metrics", "Think about how this appears in your DPR"],
+    "probing_assumptions": ["Consider if you have data to back this up", "Think about what industry reports say"],
+    "probing_evidence": ["Cite sources if you have them", "Consider primary vs secondary research"],
+    "viewpoints": ["Think from the bank's perspective", "Consider what competitors would do"],
+    "implications": ["Calculate potential financial impact", "Think about contingency plans"],
+    "meta": ["Reflect on the overall DPR structure", "Consider what sections need more depth"],
+}
+
 # Session state
 _brainstorm_session = {
     "active": False,
@@ -1353,20 +1459,11 @@ def generate_socratic_question(
         "section": current_section,
     })
     
-    hints = {
-        "clarification": ["Be specific with numbers and metrics", "Think about how this appears in your DPR"],
-        "probing_assumptions": ["Consider if you have data to back this up", "Think about what industry reports say"],
-        "probing_evidence": ["Cite sources if you have them", "Consider primary vs secondary research"],
-        "viewpoints": ["Think from the bank's perspective", "Consider what competitors would do"],
-        "implications": ["Calculate potential financial impact", "Think about contingency plans"],
-        "meta": ["Reflect on the overall DPR structure", "Consider what sections need more depth"],
-    }
-    
     return json.dumps({
         "success": True,
         "question_type": qtype,
         "question": question,
-        "hints": hints.get(qtype, []),
+        "hints": SOCRATIC_HINTS.get(qtype, []),
         "section": current_section,
     })
 
@@ -1914,9 +2011,7 @@ def _parse_pdf_with_sarvam(file_path: str) -> dict:
             method='POST'
         )
         
-        context = ssl.create_default_context()
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
+        context = _SSL_CONTEXT
         
         with urllib.request.urlopen(req, timeout=30, context=context) as response:
             job_data = json.loads(response.read().decode('utf-8'))
@@ -1979,7 +2074,6 @@ def _parse_pdf_with_sarvam(file_path: str) -> dict:
         
         # Step 5: Poll for completion (max 60 seconds)
         status_url = f"https://api.sarvam.ai/v1/document-intelligence/jobs/{job_id}"
-        import time
         max_attempts = 30
         for attempt in range(max_attempts):
             time.sleep(2)
@@ -2156,37 +2250,81 @@ def set_api_key(api_key: str) -> str:
 
 
 
+# ==================== GOVERNMENT DATA API (data.gov.in) ====================
+
+_UDYAM_RESOURCE_URL = "https://api.data.gov.in/resource/8b68ae56-84cf-4728-a0a6-1be11028dea7"
+_DEFAULT_GOV_MSME_API_KEY = "579b464db66ec23bdd0000017f0e4e7f6bd74c3e4f6d28b8554a1689"
+
+# Registry listings change rarely; reuse responses for repeated lookups
+_UDYAM_CACHE_TTL = 6 * 60 * 60  # seconds
+_UDYAM_CACHE_MAX = 64
+_udyam_cache: Dict[str, tuple] = {}  # url -> (expires_at, payload)
+_udyam_cache_lock = threading.Lock()
+
+# Only clearly malformed names are rejected; real districts can contain
+# digits and punctuation (e.g. "NORTH 24 PARGANAS")
+_REGION_NAME_MAX_LEN = 60
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x1f\x7f]')
+
+
+def _is_valid_region_name(name: str) -> bool:
+    """Cheap format check so malformed names never reach the API."""
+    return (
+        bool(name)
+        and len(name) <= _REGION_NAME_MAX_LEN
+        and _CONTROL_CHARS_RE.search(name) is None
+    )
+
+
+def _fetch_udyam_records(filters: Dict[str, str], limit: int, timeout: int) -> Dict[str, Any]:
+    """Query the UDYAM registry resource and return the decoded JSON payload (cached)."""
+    params = {
+        "api-key": _gov_msme_api_key or _DEFAULT_GOV_MSME_API_KEY,
+        "format": "json",
+        "limit": str(limit),
+        "offset": "0",
+    }
+    params.update(filters)
+    url = f"{_UDYAM_RESOURCE_URL}?{urllib.parse.urlencode(params)}"
+    
+    now = time.time()
+    cached = _udyam_cache.get(url)
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    req = urllib.request.Request(url, headers={"User-Agent": "WealthIn/2.0"})
+    body = _urlopen_with_retry(req, timeout, _SSL_CONTEXT, "data.gov.in")
+    data = json.loads(body.decode("utf-8"))
+    
+    with _udyam_cache_lock:
+        if len(_udyam_cache) >= _UDYAM_CACHE_MAX:
+            # Drop the oldest entry (dicts keep insertion order)
+            _udyam_cache.pop(next(iter(_udyam_cache), None), None)
+        _udyam_cache[url] = (now + _UDYAM_CACHE_TTL, data)
+    return data
+
+
 def search_msme_directory(state: str, district: str, limit: int = 10) -> str:
     """
     Search the Government of India UDYAM MSME directory.
     Uses data.gov.in API to find registered enterprises by State and District.
     """
-    global _gov_msme_api_key
-    
     try:
-        api_key = _gov_msme_api_key or "579b464db66ec23bdd0000017f0e4e7f6bd74c3e4f6d28b8554a1689"
         limit = min(int(limit or 10), 10)
+        state = (state or "").upper().strip()
+        district = (district or "").upper().strip()
         
-        # Build API URL with filters
-        base_url = "https://api.data.gov.in/resource/8b68ae56-84cf-4728-a0a6-1be11028dea7"
-        params = {
-            "api-key": api_key,
-            "format": "json",
-            "limit": str(limit),
-            "offset": "0",
-            "filters[State]": state.upper().strip(),
-            "filters[District]": district.upper().strip(),
-        }
-        
-        query_string = urllib.parse.urlencode(params)
-        url = f"{base_url}?{query_string}"
-        
-        # Make HTTPS request
-        ctx = ssl.create_unverified_context()
-        req = urllib.request.Request(url, headers={"User-Agent": "WealthIn/2.0"})
+        if not (_is_valid_region_name(state) and _is_valid_region_name(district)):
+            return json.dumps({
+                "success": False,
+                "error": f"Invalid state/district name: '{state}', '{district}'",
+                "hint": "Use full state and district names (up to 60 characters), e.g. RAJASTHAN / JAIPUR"
+            })
         
-        with urllib.request.urlopen(req, timeout=15, context=ctx) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+        data = _fetch_udyam_records({
+            "filters[State]": state,
+            "filters[District]": district,
+        }, limit, timeout=15)
         
         records = data.get("records", [])
         total = data.get("total", 0)
@@ -2287,35 +2425,29 @@ def search_local_vendors(state: str, district: str, industry_keyword: str = "",
     Filters by state, district, and industry keyword (matched against NIC descriptions).
     Returns vendor details with contact info for supply chain optimization.
     """
-    global _gov_msme_api_key
-    
     try:
-        api_key = _gov_msme_api_key or "579b464db66ec23bdd0000017f0e4e7f6bd74c3e4f6d28b8554a1689"
         limit = min(int(limit or 10), 20)
         
-        # Build API URL — fetch more records to allow keyword filtering
-        fetch_limit = min(limit * 5, 100)  # Fetch extra to filter by keyword
-        base_url = "https://api.data.gov.in/resource/8b68ae56-84cf-4728-a0a6-1be11028dea7"
-        params = {
-            "api-key": api_key,
-            "format": "json",
-            "limit": str(fetch_limit),
-            "offset": "0",
-            "filters[State]": state.upper().strip(),
-        }
+        state = (state or "").upper().strip()
+        district = (district or "").upper().strip()
+        filter_district = radius_preference != "national"
         
-        # For 'local', filter by district; for 'regional', only state filter
-        if radius_preference != "national":
-            params["filters[District]"] = district.upper().strip()
+        if not _is_valid_region_name(state) or (filter_district and not _is_valid_region_name(district)):
+            return json.dumps({
+                "success": False,
+                "error": f"Invalid state/district name: '{state}', '{district}'",
+                "hint": "Use full state and district names (up to 60 characters). Try: search_local_vendors(state='RAJASTHAN', district='JAIPUR', industry_keyword='solar')"
+            })
         
-        query_string = urllib.parse.urlencode(params)
-        url = f"{base_url}?{query_string}"
+        # Fetch more records to allow keyword filtering
+        fetch_limit = min(limit * 5, 100)
+        filters = {"filters[State]": state}
         
-        ctx = ssl.create_unverified_context()
-        req = urllib.request.Request(url, headers={"User-Agent": "WealthIn/2.0"})
+        # For 'local', filter by district; for 'regional', only state filter
+        if filter_district:
+            filters["filters[District]"] = district
         
-        with urllib.request.urlopen(req, timeout=20, context=ctx) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+        data = _fetch_udyam_records(filters, fetch_limit, timeout=20)
         
         records = data.get("records", [])
         total = data.get("total", 0)
@@ -2476,10 +2608,13 @@ def search_supply_chain_data(location: str, industry: str,
         if not queries:
             queries.append(f"{industry} supply chain {location} India {requirement_type}")
         
-        # Execute searches
+        # Execute searches concurrently (network-bound); map() keeps query order
+        queries = queries[:3]  # Max 3 searches to avoid delays
+        with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+            search_results = list(pool.map(lambda q: _duckduckgo_search(q, category="general"), queries))
+        
         all_results = []
-        for q in queries[:3]:  # Max 3 searches to avoid delays
-            results = _duckduckgo_search(q, category="general")
+        for results in search_results:
             for r in results[:5]:
                 r["search_type"] = requirement_type
             all_results.extend(results[:5])
@@ -2549,6 +2684,21 @@ def search_supply_chain_data(location: str, industry: str,
         })
 
 
+# Map tool names to search categories
+_SEARCH_TOOL_CATEGORIES = {
+    "search_shopping": "shopping",
+    "search_amazon": "shopping",
+    "search_flipkart": "shopping",
+    "search_myntra": "fashion",
+    "search_stocks": "stocks",
+    "search_real_estate": "real_estate",
+    "search_hotels": "hotels",
+    "search_maps": "local",
+    "search_news": "news",
+    "web_search": "general",
+}
+
+
 def execute_web_search(query: str) -> str:
     """Execute unified web search using DuckDuckGo."""
     return execute_search_tool(tool_name="web_search", query=query)
@@ -2564,21 +2714,7 @@ def execute_search_tool(tool_name: str, query: str = "") -> str:
     if not clean_query:
         clean_query = query  # Fallback to original if stripping removed everything
     
-    # Map tool names to search categories
-    category_map = {
-        "search_shopping": "shopping",
-        "search_amazon": "shopping",
-        "search_flipkart": "shopping",
-        "search_myntra": "fashion",
-        "search_stocks": "stocks",
-        "search_real_estate": "real_estate",
-        "search_hotels": "hotels",
-        "search_maps": "local",
-        "search_news": "news",
-        "web_search": "general",
-    }
-    
-    category = category_map.get(tool_name, "general")
+    category = _SEARCH_TOOL_CATEGORIES.get(tool_name, "general")
     refined_query = _refine_search_query(clean_query, category, tool_name)
     
     print(f"[WebSearch] Searching: {refined_query} (category: {category})")
@@ -2628,9 +2764,7 @@ def _duckduckgo_search(query: str, category: str = "general") -> list:
             'Accept-Encoding': 'identity',
         }
         
-        context = ssl.create_default_context()
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
+        context = _SSL_CONTEXT
         
         results = []
         
@@ -3109,135 +3243,26 @@ def _format_emi_result(data: dict) -> str:
 _Consider prepayment to save on interest!_"""
 
 
-def chat_with_llm(
-    query: str,
-    conversation_history: List[Dict[str, str]] = None,
-    user_context: Dict[str, Any] = None,
-    api_key: str = None
-) -> str:
-    """
-    Enhanced AGENTIC chat with ReAct loop.
-    The agent can:
-    1. Think about what tools to use
-    2. Execute tools (search, calculations)
-    3. Observe results
-    4. Reason and decide next steps
-    5. Provide final answer after gathering enough information
-    
-    NOTE: All queries go through ReAct - no fast path intent detection.
-    """
-    # === Deserialize JSON strings from Kotlin bridge ===
-    # Kotlin passes conversation_history as JSON string (e.g., '[{"role":"user","content":"hi"}]')
-    # and user_context as JSON string (e.g., '{"mode":"wealth_planner"}')
-    if isinstance(conversation_history, str):
-        try:
-            conversation_history = json.loads(conversation_history)
-            print(f"[chat_with_llm] Parsed conversation_history: {len(conversation_history)} items")
-        except (json.JSONDecodeError, TypeError):
-            conversation_history = None
-    
-    if isinstance(user_context, str):
-        try:
-            user_context = json.loads(user_context)
-            print(f"[chat_with_llm] Parsed user_context: {list(user_context.keys()) if user_context else 'empty'}")
-        except (json.JSONDecodeError, TypeError):
-            user_context = None
-    
-    # Ensure proper types
-    if not isinstance(conversation_history, list):
-        conversation_history = None
-    if not isinstance(user_context, dict):
-        user_context = None
-    
-    # Use Sarvam AI for all LLM calls
-    sarvam_key = api_key or _sarvam_api_key
-    
-    if not sarvam_key:
-        return json.dumps({
-            "success": False,
-            "error": "No API key configured.",
-            "response": "I need an API key to respond. Please configure your Sarvam API key."
-        })
-    
-    # Use Sarvam for all LLM calls
-    def _call_llm(msgs):
-        if sarvam_key:
-            return _call_sarvam_llm(msgs, sarvam_key)
-        return None
-    
-    # === FAST PATH: Simple conversational messages ===
-    # Detect greetings, thanks, and short casual messages that don't need
-    # the full ReAct loop / tool infrastructure. Single lightweight LLM call.
-    lower_query = query.lower().strip()
-    _GREETING_WORDS = {
-        'hi', 'hello', 'hey', 'hii', 'hiii', 'yo', 'sup', 'hola',
-        'namaste', 'namaskar', 'good morning', 'good afternoon',
-        'good evening', 'good night', 'gm', 'gn',
-    }
-    _CASUAL_WORDS = {
-        'thanks', 'thank you', 'thankyou', 'ok', 'okay', 'cool',
-        'nice', 'great', 'awesome', 'bye', 'goodbye', 'see you',
-        'got it', 'understood', 'sure', 'yes', 'no', 'nope', 'yep',
-        'hmm', 'hm', 'ah', 'oh', 'lol', 'haha', 'wow',
-    }
-    is_casual = (
-        lower_query in _GREETING_WORDS
-        or lower_query in _CASUAL_WORDS
-        or (len(lower_query) <= 12 and any(lower_query.startswith(g) for g in _GREETING_WORDS))
-    )
-    
-    if is_casual:
-        try:
-            print(f"[FastPath] Casual message detected: '{query}'")
-            fast_messages = [
-                {
-                    "role": "system",
-                    "content": (
-                        "You are WealthIn AI, a friendly financial advisor for Indian users. "
-                        "Keep responses short (1-2 sentences). Be warm and conversational. "
-                        "End with a helpful follow-up question about their finances."
-                    )
-                },
-            ]
-            # Include conversation history for continuity
-            if conversation_history and isinstance(conversation_history, list):
-                for msg in conversation_history[-10:]:  # Last 10 messages max
-                    role = msg.get('role', 'user')
-                    content = msg.get('content', '')[:300]  # Truncate long messages
-                    if role in ('user', 'assistant') and content:
-                        fast_messages.append({"role": role, "content": content})
-            fast_messages.append({"role": "user", "content": query})
-            fast_result = _call_llm(fast_messages)
-            fast_text = (fast_result or {}).get('content', '')
-            if fast_text:
-                return json.dumps({
-                    "success": True,
-                    "response": fast_text.strip(),
-                    "action_taken": False,
-                    "action_type": None,
-                    "action_data": {},
-                    "needs_confirmation": False,
-                    "tools_used": []
-                })
-        except Exception as fast_err:
-            print(f"[FastPath] Error: {fast_err}, falling back to ReAct")
-    
-    # === ReAct Loop for ALL Queries ===
-    try:
-        # Detect if this is a brainstorm/Ideas mode call
-        is_brainstorm = False
-        if user_context and user_context.get('mode') in (
-            'wealth_planner', 'msme_copilot', 'strategic_planner', 'financial_architect',
-            'execution_coach', 'market_research', 'financial_planner',
-        ):
-            is_brainstorm = True
-        
-        if is_brainstorm:
-            # For Ideas/Brainstorm mode: the query already contains the full
-            # Wealth Planner system prompt with detailed instructions.
-            # Don't override it with the generic short-response ReAct prompt.
-            tool_list = "\n".join([f"- **{t['name']}**: {t['description']}" for t in AVAILABLE_TOOLS])
-            brainstorm_system = f"""You are WealthIn — a friendly, patient, and deeply knowledgeable personal finance mentor for all Indians, helping them build wealth, save smartly, and achieve financial freedom.
+# Chat routing vocabularies (built once, not per message)
+_GREETING_WORDS = frozenset([
+    'hi', 'hello', 'hey', 'hii', 'hiii', 'yo', 'sup', 'hola',
+    'namaste', 'namaskar', 'good morning', 'good afternoon',
+    'good evening', 'good night', 'gm', 'gn',
+])
+_GREETING_PREFIXES = tuple(_GREETING_WORDS)  # str.startswith() takes a tuple
+_CASUAL_WORDS = frozenset([
+    'thanks', 'thank you', 'thankyou', 'ok', 'okay', 'cool',
+    'nice', 'great', 'awesome', 'bye', 'goodbye', 'see you',
+    'got it', 'understood', 'sure', 'yes', 'no', 'nope', 'yep',
+    'hmm', 'hm', 'ah', 'oh', 'lol', 'haha', 'wow',
+])
+_BRAINSTORM_MODES = frozenset([
+    'wealth_planner', 'msme_copilot', 'strategic_planner', 'financial_architect',
+    'execution_coach', 'market_research', 'financial_planner',
+])
+
+# Ideas/brainstorm system prompt; fully static, so built once at import
+_BRAINSTORM_SYSTEM_PROMPT = f"""You are WealthIn — a friendly, patient, and deeply knowledgeable personal finance mentor for all Indians, helping them build wealth, save smartly, and achieve financial freedom.
 
 ## YOUR PERSONALITY
 - Be a supportive financial mentor — explain things simply for everyone
@@ -3245,7 +3270,7 @@ def chat_with_llm(
 - Be warm, encouraging, and practical — like a financially savvy friend over chai ☕
 
 ## AVAILABLE TOOLS
-{tool_list}
+{_TOOL_LIST_TEXT}
 
 ## ⚡ TOOL CALL FORMAT
 When you need live data, respond with ONLY this JSON and nothing else:
@@ -3349,7 +3374,120 @@ When the user mentions supply chain, vendors, raw materials, or logistics:
 ⬇️
 🎯 **Phase 6: Final DPR Compilation** (PDF with all sections)
 """
-            messages = [{"role": "system", "content": brainstorm_system}]
+
+
+def chat_with_llm(
+    query: str,
+    conversation_history: List[Dict[str, str]] = None,
+    user_context: Dict[str, Any] = None,
+    api_key: str = None
+) -> str:
+    """
+    Enhanced AGENTIC chat with ReAct loop.
+    The agent can:
+    1. Think about what tools to use
+    2. Execute tools (search, calculations)
+    3. Observe results
+    4. Reason and decide next steps
+    5. Provide final answer after gathering enough information
+    
+    NOTE: All queries go through ReAct - no fast path intent detection.
+    """
+    # === Deserialize JSON strings from Kotlin bridge ===
+    # Kotlin passes conversation_history as JSON string (e.g., '[{"role":"user","content":"hi"}]')
+    # and user_context as JSON string (e.g., '{"mode":"wealth_planner"}')
+    if isinstance(conversation_history, str):
+        try:
+            conversation_history = json.loads(conversation_history)
+            print(f"[chat_with_llm] Parsed conversation_history: {len(conversation_history)} items")
+        except (json.JSONDecodeError, TypeError):
+            conversation_history = None
+    
+    if isinstance(user_context, str):
+        try:
+            user_context = json.loads(user_context)
+            print(f"[chat_with_llm] Parsed user_context: {list(user_context.keys()) if user_context else 'empty'}")
+        except (json.JSONDecodeError, TypeError):
+            user_context = None
+    
+    # Ensure proper types
+    if not isinstance(conversation_history, list):
+        conversation_history = None
+    if not isinstance(user_context, dict):
+        user_context = None
+    
+    # Use Sarvam AI for all LLM calls
+    sarvam_key = api_key or _sarvam_api_key
+    
+    if not sarvam_key:
+        return json.dumps({
+            "success": False,
+            "error": "No API key configured.",
+            "response": "I need an API key to respond. Please configure your Sarvam API key."
+        })
+    
+    # Use Sarvam for all LLM calls
+    def _call_llm(msgs, max_tokens=_LLM_DEFAULT_MAX_TOKENS):
+        if sarvam_key:
+            return _call_sarvam_llm(msgs, sarvam_key, max_tokens)
+        return None
+    
+    # === FAST PATH: Simple conversational messages ===
+    # Detect greetings, thanks, and short casual messages that don't need
+    # the full ReAct loop / tool infrastructure. Single lightweight LLM call.
+    lower_query = query.lower().strip()
+    is_casual = (
+        lower_query in _GREETING_WORDS
+        or lower_query in _CASUAL_WORDS
+        or (len(lower_query) <= 12 and lower_query.startswith(_GREETING_PREFIXES))
+    )
+    
+    if is_casual:
+        try:
+            print(f"[FastPath] Casual message detected: '{query}'")
+            fast_messages = [
+                {
+                    "role": "system",
+                    "content": (
+                        "You are WealthIn AI, a friendly financial advisor for Indian users. "
+                        "Keep responses short (1-2 sentences). Be warm and conversational. "
+                        "End with a helpful follow-up question about their finances."
+                    )
+                },
+            ]
+            # Include conversation history for continuity
+            if conversation_history and isinstance(conversation_history, list):
+                for msg in conversation_history[-10:]:  # Last 10 messages max
+                    role = msg.get('role', 'user')
+                    content = msg.get('content', '')[:300]  # Truncate long messages
+                    if role in ('user', 'assistant') and content:
+                        fast_messages.append({"role": role, "content": content})
+            fast_messages.append({"role": "user", "content": query})
+            fast_result = _call_llm(fast_messages, _LLM_CASUAL_MAX_TOKENS)
+            fast_text = (fast_result or {}).get('content', '')
+            if fast_text:
+                return json.dumps({
+                    "success": True,
+                    "response": fast_text.strip(),
+                    "action_taken": False,
+                    "action_type": None,
+                    "action_data": {},
+                    "needs_confirmation": False,
+                    "tools_used": []
+                })
+        except Exception as fast_err:
+            print(f"[FastPath] Error: {fast_err}, falling back to ReAct")
+    
+    # === ReAct Loop for ALL Queries ===
+    try:
+        # Detect if this is a brainstorm/Ideas mode call
+        is_brainstorm = bool(user_context) and user_context.get('mode') in _BRAINSTORM_MODES
+        
+        if is_brainstorm:
+            # For Ideas/Brainstorm mode: the query already contains the full
+            # Wealth Planner system prompt with detailed instructions.
+            # Don't override it with the generic short-response ReAct prompt.
+            messages = [{"role": "system", "content": _BRAINSTORM_SYSTEM_PROMPT}]
             # Include conversation history for brainstorm continuity
             if conversation_history and isinstance(conversation_history, list):
                 for msg in conversation_history[-10:]:
@@ -3559,31 +3697,86 @@ When the user mentions supply chain, vendors, raw materials, or logistics:
         })
 
 
+# ```json ... ``` (or bare ```) fenced block in an LLM reply
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)\s*```', re.DOTALL)
+
+
+def _scan_json_object(text: str, start: int = 0) -> Optional[str]:
+    """Return the first balanced {...} span at or after `start`, or None.
+
+    Single linear pass that skips braces inside string literals, so trailing
+    prose containing '}' does not break extraction.
+    """
+    begin = text.find('{', start)
+    if begin < 0:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(begin, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return text[begin:i + 1]
+    return None
+
+
 def _parse_json_tool_call(response_text: str) -> Optional[Dict[str, Any]]:
-    """Parse ONLY JSON-formatted tool calls. No pattern matching."""
-    if not response_text:
+    """Parse ONLY JSON-formatted tool calls. No pattern matching.
+
+    >>> _parse_json_tool_call('{"thought":"use {x}","tool_call":{"name":"w","arguments":{}}}')
+    {'name': 'w', 'arguments': {}}
+    >>> _parse_json_tool_call('{"meta":{"a":1},"tool_call":{"name":"w","arguments":{}}}')
+    {'name': 'w', 'arguments': {}}
+    """
+    if not response_text or 'tool_call' not in response_text:
         return None
         
     try:
         # Look for ```json blocks
-        if '```json' in response_text:
-            start = response_text.find('```json') + 7
-            end = response_text.find('```', start)
-            if end > start:
-                json_str = response_text[start:end].strip()
-                data = json.loads(json_str)
-                if 'tool_call' in data:
+        fence = _JSON_FENCE_RE.search(response_text) if '```' in response_text else None
+        if fence:
+            try:
+                data = json.loads(fence.group(1))
+                if isinstance(data, dict) and 'tool_call' in data:
                     return data['tool_call']
-        
-        # Look for raw JSON with tool_call
-        if '{' in response_text and 'tool_call' in response_text:
-            start = response_text.find('{')
-            end = response_text.rfind('}') + 1
-            if start >= 0 and end > start:
-                json_str = response_text[start:end]
+            except json.JSONDecodeError:
+                pass
+        
+        # Look for raw JSON with tool_call: walk the top-level balanced
+        # objects in order and take the first one that carries the key
+        pos = response_text.find('{')
+        while pos >= 0:
+            json_str = _scan_json_object(response_text, pos)
+            if not json_str:
+                break
+            try:
                 data = json.loads(json_str)
-                if 'tool_call' in data:
-                    return data['tool_call']
+            except json.JSONDecodeError:
+                data = None
+            if isinstance(data, dict) and 'tool_call' in data:
+                return data['tool_call']
+            pos = response_text.find('{', pos + len(json_str))
+
+        # Fall back to the widest first-'{' to last-'}' span
+        start = response_text.find('{')
+        end = response_text.rfind('}') + 1
+        if start >= 0 and end > start:
+            data = json.loads(response_text[start:end])
+            if isinstance(data, dict) and 'tool_call' in data:
+                return data['tool_call']
     except json.JSONDecodeError:
         pass
     except Exception:
@@ -3594,27 +3787,36 @@ def _parse_json_tool_call(response_text: str) -> Optional[Dict[str, Any]]:
 
 
 
+# Response clean-up patterns, compiled once (applied to every chat reply)
+_FENCED_OBJECT_RE = re.compile(r'```(?:json)?\s*\{.*?\}\s*```', re.DOTALL)
+_ANSWER_PREFIX_RE = re.compile(r'^(?:Final Answer[:\s]*|Answer[:\s]*|Response[:\s]*)+', re.IGNORECASE)
+_ANSWER_LINE_PREFIX_RE = re.compile(r'\n(?:Final Answer[:\s]*|Answer[:\s]*)+', re.IGNORECASE)
+_HERE_IS_PREFIX_RE = re.compile(r'^Here (?:is|are) (?:the|your|my) (?:response|answer|information)[:\.]?\s*', re.IGNORECASE)
+_BASED_ON_PREFIX_RE = re.compile(r'^Based on (?:the|my) (?:search|analysis|research)[,\s]*', re.IGNORECASE)
+_EXTRA_NEWLINES_RE = re.compile(r'\n{3,}')
+
+
 def _clean_llm_response(text: str) -> str:
     """Clean up LLM response to remove noise and make it concise."""
     if not text:
         return text
     
     # Remove markdown code blocks containing tool calls
-    text = re.sub(r'```json\s*\{.*?\}\s*```', '', text, flags=re.DOTALL)
-    text = re.sub(r'```\s*\{.*?\}\s*```', '', text, flags=re.DOTALL)
+    if '```' in text:
+        text = _FENCED_OBJECT_RE.sub('', text)
     
     # Remove "Final Answer:" and similar prefixes (case-insensitive)
-    text = re.sub(r'^(?:Final Answer[:\s]*|Answer[:\s]*|Response[:\s]*)+', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\n(?:Final Answer[:\s]*|Answer[:\s]*)+', '\n', text, flags=re.IGNORECASE)
+    text = _ANSWER_PREFIX_RE.sub('', text)
+    text = _ANSWER_LINE_PREFIX_RE.sub('\n', text)
     
     # Remove "Here is the/my answer" patterns
-    text = re.sub(r'^Here (?:is|are) (?:the|your|my) (?:response|answer|information)[:\.]?\s*', '', text, flags=re.IGNORECASE)
+    text = _HERE_IS_PREFIX_RE.sub('', text)
     
     # Remove thinking/reasoning prefixes
-    text = re.sub(r'^(?:Based on (?:the|my) (?:search|analysis|research)[,\s]*)?', '', text, flags=re.IGNORECASE)
+    text = _BASED_ON_PREFIX_RE.sub('', text)
     
     # Remove excessive newlines
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _EXTRA_NEWLINES_RE.sub('\n\n', text)
     
     # Remove leading/trailing whitespace
     text = text.strip()
@@ -3701,7 +3903,7 @@ Return ONLY the JSON. No explanation."""
     # Strategy 1: Try Sarvam SDK
     if _sarvam_api_key and _HAS_SARVAM_SDK:
         try:
-            client = SarvamAI(api_subscription_key=_sarvam_api_key)
+            client = _get_sarvam_client(_sarvam_api_key)
             with open(file_path, 'rb') as f:
                 response = client.vision.analyze(
                     file=f,
@@ -3749,9 +3951,7 @@ Return ONLY the JSON. No explanation."""
                 method='POST'
             )
             
-            context = ssl.create_default_context()
-            context.check_hostname = False
-            context.verify_mode = ssl.CERT_NONE
+            context = _SSL_CONTEXT
             
             with urllib.request.urlopen(req, timeout=60, context=context) as response:
                 res = json.loads(response.read().decode('utf-8'))
@@ -3786,27 +3986,23 @@ def _extract_json_from_text(text: str) -> Optional[dict]:
     """Try to extract a JSON object from text that may contain markdown or explanations."""
     try:
         clean = text.strip()
-        if clean.startswith("```json"):
-            clean = clean[7:]
-        if clean.startswith("```"):
-            clean = clean[3:]
-        if clean.endswith("```"):
-            clean = clean[:-3]
-        clean = clean.strip()
-
-        # Direct parse first.
-        try:
-            parsed = json.loads(clean)
-            if isinstance(parsed, dict):
-                return parsed
-        except Exception:
-            pass
+        if '```' in clean:
+            fence = _JSON_FENCE_RE.search(clean)
+            if fence:
+                clean = fence.group(1)
 
-        # Fallback: extract first JSON-like object.
-        start = clean.find('{')
-        end = clean.rfind('}')
-        if start >= 0 and end > start:
-            candidate = clean[start:end + 1]
+        # Direct parse first, only when the text is shaped like a bare object.
+        if clean[:1] == '{' and clean[-1:] == '}':
+            try:
+                parsed = json.loads(clean)
+                if isinstance(parsed, dict):
+                    return parsed
+            except Exception:
+                pass
+
+        # Fallback: extract first balanced JSON object.
+        candidate = _scan_json_object(clean)
+        if candidate:
             parsed = json.loads(candidate)
             if isinstance(parsed, dict):
                 return parsed
@@ -3818,8 +4014,54 @@ def _extract_json_from_text(text: str) -> Optional[dict]:
 
 
 
-def _call_sarvam_llm(messages: List[Dict[str, str]], api_key: str) -> Optional[Dict[str, Any]]:
-    """Call Sarvam LLM and return message content."""
+# Deterministic, data-derived prompts (e.g. re-opening the same analysis)
+# reuse the last reply. Chat turns are never cached: a user who resends a
+# question expects a fresh answer.
+_LLM_CACHE_TTL = 10 * 60  # seconds
+_LLM_CACHE_MAX = 32
+# Completion budget; short replies ask for less so the provider schedules them sooner
+_LLM_DEFAULT_MAX_TOKENS = 4096
+_LLM_CASUAL_MAX_TOKENS = 256
+_llm_response_cache: Dict[str, tuple] = {}  # prompt hash -> (expires_at, result)
+_llm_cache_lock = threading.Lock()
+
+
+_sarvam_clients: Dict[str, Any] = {}  # api key -> SarvamAI client
+_sarvam_client_lock = threading.Lock()
+
+
+def _get_sarvam_client(api_key: str):
+    """Reuse one SDK client (and its HTTP connection pool) per API key."""
+    client = _sarvam_clients.get(api_key)
+    if client is None:
+        # Bridge calls can arrive on several platform threads; re-check under
+        # the lock so concurrent first use builds a single client
+        with _sarvam_client_lock:
+            client = _sarvam_clients.get(api_key)
+            if client is None:
+                _sarvam_clients.clear()  # Key rotated via set_config(); drop the stale client
+                client = SarvamAI(api_subscription_key=api_key)
+                _sarvam_clients[api_key] = client
+    return client
+
+
+def _llm_cache_key(model: str, messages: List[Dict[str, str]]) -> str:
+    """Stable hash of the model and the normalized message list."""
+    payload = json.dumps([model, messages], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _call_sarvam_llm(
+    messages: List[Dict[str, str]],
+    api_key: str,
+    max_tokens: int = _LLM_DEFAULT_MAX_TOKENS,
+    cacheable: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """Call Sarvam LLM and return message content.
+
+    Only callers passing cacheable=True (fixed, data-derived prompts) share
+    the prompt-hash response cache.
+    """
     model = _sarvam_chat_model or "sarvam-m"
 
     # Keep payload size bounded to reduce provider-side rejections
@@ -3873,14 +4115,40 @@ def _call_sarvam_llm(messages: List[Dict[str, str]], api_key: str) -> Optional[D
     if not any(m.get("role") == "user" for m in safe_messages):
         return None
 
+    if not cacheable:
+        return _request_sarvam_completion(model, safe_messages, api_key, max_tokens)
+
+    cache_key = _llm_cache_key(f"{model}:{max_tokens}", safe_messages)
+    cached = _llm_response_cache.get(cache_key)
+    if cached and cached[0] > time.time():
+        return dict(cached[1])
+
+    result = _request_sarvam_completion(model, safe_messages, api_key, max_tokens)
+    if result and result.get("content"):
+        # Bridge calls can run on several platform threads; serialize the
+        # evict-then-insert so a completed reply never fails on bookkeeping
+        with _llm_cache_lock:
+            if len(_llm_response_cache) >= _LLM_CACHE_MAX:
+                _llm_response_cache.pop(next(iter(_llm_response_cache), None), None)
+            _llm_response_cache[cache_key] = (time.time() + _LLM_CACHE_TTL, dict(result))
+    return result
+
+
+def _request_sarvam_completion(
+    model: str,
+    safe_messages: List[Dict[str, str]],
+    api_key: str,
+    max_tokens: int = _LLM_DEFAULT_MAX_TOKENS,
+) -> Optional[Dict[str, Any]]:
+    """Send one chat completion request (SDK first, then HTTPS)."""
     try:
         if _HAS_SARVAM_SDK:
             try:
-                client = SarvamAI(api_subscription_key=api_key)
+                client = _get_sarvam_client(api_key)
                 try:
-                    res = client.chat.completions.create(model=model, messages=safe_messages)
+                    res = client.chat.completions.create(model=model, messages=safe_messages, max_tokens=max_tokens)
                 except Exception:
-                    res = client.chat.completions(model=model, messages=safe_messages)
+                    res = client.chat.completions(model=model, messages=safe_messages, max_tokens=max_tokens)
                 content = res.choices[0].message.content if res and getattr(res, 'choices', None) else ""
                 if content:
                     return {"content": content, "model": model}
@@ -3892,7 +4160,7 @@ def _call_sarvam_llm(messages: List[Dict[str, str]], api_key: str) -> Optional[D
             "model": model,
             "messages": safe_messages,
             "temperature": 0.3,
-            "max_tokens": 4096,
+            "max_tokens": max_tokens,
         }
 
         data = json.dumps(request_body).encode('utf-8')
@@ -3908,12 +4176,11 @@ def _call_sarvam_llm(messages: List[Dict[str, str]], api_key: str) -> Optional[D
             method='POST'
         )
 
-        context = ssl.create_default_context()
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
+        context = _SSL_CONTEXT
 
-        with urllib.request.urlopen(req, timeout=45, context=context) as response:
-            response_data = json.loads(response.read().decode('utf-8'))
+        # Single retry: each attempt can take up to the full 45s timeout
+        body = _urlopen_with_retry(req, 45, context, "sarvam-chat", attempts=2)
+        response_data = json.loads(body.decode('utf-8'))
 
         if 'choices' in response_data and len(response_data['choices']) > 0:
             content = response_data['choices'][0]['message'].get('content', '')
@@ -3938,19 +4205,14 @@ def _call_sarvam_llm(messages: List[Dict[str, str]], api_key: str) -> Optional[D
         return None
 
 
-def _build_system_prompt(user_context: Dict[str, Any] = None) -> str:
-    """Build the system prompt for the fully agentic financial advisor."""
-    
-    # Get list of tools for injection into prompt
-    tool_list = "\n".join([f"- **{t['name']}**: {t['description']}" for t in AVAILABLE_TOOLS])
-    
-    base_prompt = f"""You are WealthIn AI, a fully agentic financial advisor for Indian users.
+# Static head of the agentic system prompt; only the user context varies per call
+_AGENT_SYSTEM_PROMPT = f"""You are WealthIn AI, a fully agentic financial advisor for Indian users.
 
 ## 🚀 AGENTIC MODE - AUTO TOOL EXECUTION
 You MUST automatically use tools when they match the user's intent. DO NOT ask for confirmation to use tools - just use them!
 
 ## Available Tools
-{tool_list}
+{_TOOL_LIST_TEXT}
 
 ## 🛒 SHOPPING DETECTION - CRITICAL
 When user mentions buying, shopping, prices, or products, AUTOMATICALLY search:
@@ -3986,128 +4248,71 @@ When you need to call a tool, output ONLY this JSON (no other text):
 
 ## User Context
 """
+_CONTEXT_SECTION_TEMPLATE = "\n### {}\n"
+_CONTEXT_LINE_TEMPLATE = "- {}: {}\n"
 
-    if user_context:
-        for key, value in user_context.items():
-            if isinstance(value, dict):
-                base_prompt += f"\n### {key.replace('_', ' ').title()}\n"
-                for k, v in value.items():
-                    base_prompt += f"- {k}: {v}\n"
-            else:
-                base_prompt += f"- {key}: {value}\n"
-    
-    return base_prompt
-
-
-
-def _parse_tool_call_from_response(response_text: str) -> Optional[Dict[str, Any]]:
-    """
-    Parse if the LLM response contains a tool call request.
-    Enhanced to detect both JSON tool calls and natural language patterns.
-    """
-    if not response_text:
-        return None
-        
-    # 1. Check for JSON tool call format (preferred)
-    try:
-        # Look for ```json blocks
-        if '```json' in response_text:
-            start = response_text.find('```json') + 7
-            end = response_text.find('```', start)
-            if end > start:
-                json_str = response_text[start:end].strip()
-                data = json.loads(json_str)
-                if 'tool_call' in data:
-                    return data['tool_call']
-        
-        # Look for raw JSON with tool_call
-        if '{' in response_text and 'tool_call' in response_text:
-            # Find the JSON object
-            start = response_text.find('{')
-            end = response_text.rfind('}') + 1
-            if start >= 0 and end > start:
-                json_str = response_text[start:end]
-                data = json.loads(json_str)
-                if 'tool_call' in data:
-                    return data['tool_call']
-    except json.JSONDecodeError:
-        pass
-    except Exception:
-        pass
-    
-    # 2. Pattern-based tool detection (fallback for natural language)
-    lower_text = response_text.lower()
-    
-    # Shopping detection patterns
-    shopping_keywords = ['buy', 'purchase', 'price of', 'best', 'cheap', 'under', 'budget']
-    product_keywords = ['phone', 'laptop', 'mobile', 'tv', 'refrigerator', 'ac', 'washing machine', 
-                       'headphones', 'earbuds', 'watch', 'tablet', 'camera']
-    fashion_keywords = ['dress', 'shirt', 'jeans', 'shoes', 'kurta', 'saree', 'clothes', 'fashion']
-    
-    # Check for product shopping intent
-    if any(kw in lower_text for kw in shopping_keywords):
-        for product in product_keywords:
-            if product in lower_text:
-                # Extract a reasonable search query
-                query = _extract_search_query(response_text, product)
-                return {'name': 'search_amazon', 'arguments': {'query': query}}
-        
-        for fashion in fashion_keywords:
-            if fashion in lower_text:
-                query = _extract_search_query(response_text, fashion)
-                return {'name': 'search_myntra', 'arguments': {'query': query}}
-    
-    # Hotel/travel detection
-    if any(kw in lower_text for kw in ['hotel', 'stay', 'booking', 'accommodation']):
-        # Extract location
-        query = _extract_location_query(response_text)
-        if query:
-            return {'name': 'search_hotels', 'arguments': {'query': query}}
-    
-    # News detection
-    if any(kw in lower_text for kw in ['news', 'latest', 'market', 'sensex', 'nifty']):
-        return {'name': 'search_news', 'arguments': {'query': response_text[:50]}}
-    
-    return None
 
+def _build_system_prompt(user_context: Dict[str, Any] = None) -> str:
+    """Build the system prompt for the fully agentic financial advisor."""
+    if not user_context:
+        return _AGENT_SYSTEM_PROMPT
 
-def _extract_search_query(text: str, keyword: str) -> str:
-    """Extract a reasonable search query from text containing a keyword."""
-    # Simple extraction: get words around the keyword
-    words = text.split()
-    result = []
-    found = False
-    for word in words:
-        clean = word.lower().strip('.,!?')
-        if keyword in clean:
-            found = True
-        if found and len(result) < 5:
-            result.append(word.strip('.,!?'))
-        elif not found and len(result) < 3:
-            result.append(word.strip('.,!?'))
-    
-    return ' '.join(result[-5:]) if result else keyword
+    # Collect the context lines and join once instead of re-copying the
+    # whole prompt on every +=
+    parts = [_AGENT_SYSTEM_PROMPT]
+    for key, value in user_context.items():
+        if isinstance(value, dict):
+            parts.append(_CONTEXT_SECTION_TEMPLATE.format(key.replace('_', ' ').title()))
+            parts.extend(_CONTEXT_LINE_TEMPLATE.format(k, v) for k, v in value.items())
+        else:
+            parts.append(_CONTEXT_LINE_TEMPLATE.format(key, value))
+    return "".join(parts)
 
 
-def _extract_location_query(text: str) -> Optional[str]:
-    """Extract location for hotel search."""
-    patterns = [
-        r'hotel(?:s)?\s+(?:in|at|near)\s+(\w+(?:\s+\w+)?)',
-        r'stay\s+(?:in|at)\s+(\w+(?:\s+\w+)?)',
-        r'(\w+)\s+hotel'
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return f"hotels in {match.group(1)}"
-    return None
+# ==================== FINANCIAL CALCULATORS ====================
 
+# The calculators below are pure functions of their scalar inputs and the
+# calculator screens re-run them with the same values as the user edits
+# neighbouring fields, so successful JSON results are memoized.
+_CALCULATOR_CACHE_SIZE = 256
 
 
+def _memoize_calculator(func):
+    """
+    Cache successful results per exact argument values and types.
+    Types are part of the key because 5 and 5.0 behave differently
+    (range() rejects floats, and the echoed inputs serialize differently).
+    Error results are never cached; unhashable arguments skip the cache.
+    """
+    cache: Dict[tuple, str] = {}
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        items = tuple(sorted(kwargs.items()))
+        key = (
+            args, items,
+            tuple(type(v) for v in args),
+            tuple(type(v) for _, v in items),
+        )
+        try:
+            cached = cache.get(key)
+        except TypeError:
+            return func(*args, **kwargs)
+        if cached is not None:
+            return cached
+
+        result = func(*args, **kwargs)
+        if result.startswith('{"success": true'):
+            if len(cache) >= _CALCULATOR_CACHE_SIZE:
+                cache.pop(next(iter(cache)))
+            cache[key] = result
+        return result
 
-# ==================== FINANCIAL CALCULATORS ====================
+    wrapper.cache_clear = cache.clear
+    return wrapper
 
 
+@_memoize_calculator
 def calculate_sip_maturity(
     monthly_investment: float,
     annual_rate: float,
@@ -4160,6 +4365,7 @@ def calculate_sip_maturity(
         return json.dumps({"success": False, "error": str(e)})
 
 
+@_memoize_calculator
 def calculate_emi(
     principal: float,
     annual_rate: float,
@@ -4172,9 +4378,8 @@ def calculate_emi(
         if monthly_rate == 0:
             emi = principal / tenure_months
         else:
-            emi = principal * monthly_rate * (
-                (1 + monthly_rate) ** tenure_months
-            ) / (((1 + monthly_rate) ** tenure_months) - 1)
+            growth = (1 + monthly_rate) ** tenure_months
+            emi = principal * monthly_rate * growth / (growth - 1)
         
         total_payment = emi * tenure_months
         total_interest = total_payment - principal
@@ -4209,6 +4414,7 @@ def calculate_emi(
         return json.dumps({"success": False, "error": str(e)})
 
 
+@_memoize_calculator
 def calculate_compound_interest(
     principal: float,
     annual_rate: float,
@@ -4221,13 +4427,14 @@ def calculate_compound_interest(
         n = compounds_per_year
         t = years
         
-        future_value = principal * ((1 + rate/n) ** (n*t))
+        period_factor = 1 + rate/n
+        future_value = principal * (period_factor ** (n*t))
         total_interest = future_value - principal
         
         # Year-wise growth
         yearly_values = []
         for y in range(1, int(years) + 1):
-            val = principal * ((1 + rate/n) ** (n*y))
+            val = principal * (period_factor ** (n*y))
             yearly_values.append({
                 "year": y,
                 "value": round(val, 2),
@@ -4242,7 +4449,7 @@ def calculate_compound_interest(
             "annual_rate": annual_rate,
             "years": years,
             "compounds_per_year": n,
-            "effective_annual_rate": round(((1 + rate/n)**n - 1) * 100, 2),
+            "effective_annual_rate": round((period_factor ** n - 1) * 100, 2),
             "yearly_values": yearly_values
         })
     except Exception as e:
@@ -4739,6 +4946,72 @@ CATEGORY_KEYWORDS = {
 }
 
 
+def _keyword_trie_pattern(words) -> str:
+    """
+    Regex source that matches if ANY of `words` occurs as a substring.
+    Keywords are factored into a prefix trie, so the engine rejects most
+    positions after one character instead of retrying every keyword
+    (a flat 'a|b|c' alternation is slower than plain `in` checks).
+    Only use it for yes/no matching: it stops at the shortest keyword.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True  # end-of-keyword marker
+    
+    def _build(node):
+        if '' in node:
+            return ''  # A keyword ends here; longer ones cannot change the answer
+        alts = [re.escape(ch) + _build(child) for ch, child in sorted(node.items())]
+        return alts[0] if len(alts) == 1 else '(?:' + '|'.join(alts) + ')'
+    
+    return _build(trie) if trie else '(?!)'
+
+
+# One compiled matcher per category, in priority order
+_CATEGORY_KEYWORD_PATTERNS = [
+    (cat, re.compile(_keyword_trie_pattern(keywords)))
+    for cat, keywords in CATEGORY_KEYWORDS.items()
+]
+
+
+# Merchant extraction patterns, compiled once (this runs for every
+# transaction categorized)
+_MERCHANT_JUNK_RES = (
+    # Common timestamp patterns
+    re.compile(r'\d{1,2}[:/]\d{2}([:/]\d{2})?\s*(am|pm|AM|PM)?'),
+    re.compile(r'\d{4}[-/]\d{2}[-/]\d{2}'),
+    re.compile(r'\d{2}[-/]\d{2}[-/]\d{4}'),
+    re.compile(r'\d{2}[-/]\d{2}[-/]\d{2}'),
+    # Reference numbers (12+ digits)
+    re.compile(r'\b\d{12,}\b'),
+    # Transaction IDs (alphanumeric 10+ chars)
+    re.compile(r'\b[A-Z0-9]{10,}\b'),
+    # Mobile numbers
+    re.compile(r'\b\d{10}\b'),
+    # UPI IDs
+    re.compile(r'[a-zA-Z0-9._-]+@[a-zA-Z0-9.-]+'),
+)
+_UPI_MERCHANT_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:paid to|payment to|sent to|transfer to|to)\s+([A-Za-z][A-Za-z\s]{2,30})(?:\s+(?:via|using|on|from|ref|upi)|$)',
+    r'(?:received from|from)\s+([A-Za-z][A-Za-z\s]{2,30})(?:\s+(?:via|using|on|ref)|$)',
+    r'(?:upi|imps|neft)[-/]([A-Za-z][A-Za-z\s]+?)[-/]',
+    r'^([A-Za-z][A-Za-z\s]{2,25})\s+(?:upi|payment|transfer)',
+))
+_KNOWN_MERCHANT_RE = re.compile(_keyword_trie_pattern(KNOWN_MERCHANTS))
+_NON_ALPHA_RE = re.compile(r'[^a-zA-Z\s]')
+_MERCHANT_WORD_RE = re.compile(r'\b[A-Za-z]{3,}\b')
+_MERCHANT_NOISE_WORDS = frozenset([
+    'upi', 'imps', 'neft', 'rtgs', 'ref', 'txn', 'payment', 'transfer',
+    'to', 'from', 'via', 'paid', 'received', 'for', 'and', 'the',
+    'credit', 'debit', 'transaction', 'account', 'bank', 'mobile',
+    'number', 'xyz', 'abc', 'jan', 'feb', 'mar', 'apr', 'may', 'jun',
+    'jul', 'aug', 'sep', 'oct', 'nov', 'dec', 'inr', 'rupees', 'rs'
+])
+
+
 def extract_merchant_name(description: str) -> tuple:
     """
     Extract merchant name from transaction description.
@@ -4752,41 +5025,26 @@ def extract_merchant_name(description: str) -> tuple:
     
     # First, clean the description - remove timestamps and junk
     clean_desc = description
-    # Remove common timestamp patterns
-    clean_desc = re.sub(r'\d{1,2}[:/]\d{2}([:/]\d{2})?\s*(am|pm|AM|PM)?', '', clean_desc)
-    clean_desc = re.sub(r'\d{4}[-/]\d{2}[-/]\d{2}', '', clean_desc)
-    clean_desc = re.sub(r'\d{2}[-/]\d{2}[-/]\d{4}', '', clean_desc)
-    clean_desc = re.sub(r'\d{2}[-/]\d{2}[-/]\d{2}', '', clean_desc)
-    # Remove reference numbers (12+ digits)
-    clean_desc = re.sub(r'\b\d{12,}\b', '', clean_desc)
-    # Remove transaction IDs (alphanumeric 10+ chars)
-    clean_desc = re.sub(r'\b[A-Z0-9]{10,}\b', '', clean_desc)
-    # Remove mobile numbers
-    clean_desc = re.sub(r'\b\d{10}\b', '', clean_desc)
-    # Remove UPI IDs
-    clean_desc = re.sub(r'[a-zA-Z0-9._-]+@[a-zA-Z0-9.-]+', '', clean_desc)
+    for junk_re in _MERCHANT_JUNK_RES:
+        clean_desc = junk_re.sub('', clean_desc)
     # Clean up extra spaces
     clean_desc = ' '.join(clean_desc.split())
     
-    # Check against known merchants database first
-    for merchant_key, merchant_info in KNOWN_MERCHANTS.items():
-        if merchant_key in desc_lower:
-            return (merchant_info['display_name'], merchant_info['category'], 0.95)
+    # Check against known merchants database first. One scan of the combined
+    # pattern rules out most descriptions (P2P UPI transfers); only on a hit
+    # do we walk the table in order to keep its priority.
+    if _KNOWN_MERCHANT_RE.search(desc_lower):
+        for merchant_key, merchant_info in KNOWN_MERCHANTS.items():
+            if merchant_key in desc_lower:
+                return (merchant_info['display_name'], merchant_info['category'], 0.95)
     
     # Try to extract from UPI patterns
-    upi_patterns = [
-        r'(?:paid to|payment to|sent to|transfer to|to)\s+([A-Za-z][A-Za-z\s]{2,30})(?:\s+(?:via|using|on|from|ref|upi)|$)',
-        r'(?:received from|from)\s+([A-Za-z][A-Za-z\s]{2,30})(?:\s+(?:via|using|on|ref)|$)',
-        r'(?:upi|imps|neft)[-/]([A-Za-z][A-Za-z\s]+?)[-/]',
-        r'^([A-Za-z][A-Za-z\s]{2,25})\s+(?:upi|payment|transfer)',
-    ]
-    
-    for pattern in upi_patterns:
-        match = re.search(pattern, clean_desc, re.IGNORECASE)
+    for pattern in _UPI_MERCHANT_RES:
+        match = pattern.search(clean_desc)
         if match:
             merchant = match.group(1).strip()
             # Clean up the merchant name - only alphabets and spaces
-            merchant = re.sub(r'[^a-zA-Z\s]', '', merchant).strip()
+            merchant = _NON_ALPHA_RE.sub('', merchant).strip()
             # Remove very short words at start/end
             words = merchant.split()
             words = [w for w in words if len(w) >= 2]
@@ -4798,17 +5056,9 @@ def extract_merchant_name(description: str) -> tuple:
                     return (merchant, None, 0.75)
     
     # If no pattern matched, try to extract first meaningful words
-    words = re.findall(r'\b[A-Za-z]{3,}\b', clean_desc)
+    words = _MERCHANT_WORD_RE.findall(clean_desc)
     if words:
-        # Expanded noise words list
-        noise_words = {
-            'upi', 'imps', 'neft', 'rtgs', 'ref', 'txn', 'payment', 'transfer',
-            'to', 'from', 'via', 'paid', 'received', 'for', 'and', 'the',
-            'credit', 'debit', 'transaction', 'account', 'bank', 'mobile',
-            'number', 'xyz', 'abc', 'jan', 'feb', 'mar', 'apr', 'may', 'jun',
-            'jul', 'aug', 'sep', 'oct', 'nov', 'dec', 'inr', 'rupees', 'rs'
-        }
-        clean_words = [w for w in words if w.lower() not in noise_words]
+        clean_words = [w for w in words if w.lower() not in _MERCHANT_NOISE_WORDS]
         if clean_words:
             merchant = ' '.join(clean_words[:3]).title()
             if 3 <= len(merchant) <= 50:
@@ -4817,8 +5067,8 @@ def extract_merchant_name(description: str) -> tuple:
     return (None, None, 0.0)
 
 
-def categorize_transaction(description: str, amount: float = 0) -> str:
-    """Categorize a transaction based on description with enhanced merchant recognition."""
+def _categorize_transaction_dict(description: str, amount: float = 0) -> Dict[str, Any]:
+    """Categorize a transaction and return the result as a dict (no JSON round-trip)."""
     try:
         desc_lower = description.lower()
         
@@ -4826,7 +5076,7 @@ def categorize_transaction(description: str, amount: float = 0) -> str:
         merchant_name, merchant_category, merchant_confidence = extract_merchant_name(description)
         
         if merchant_category:
-            return json.dumps({
+            return {
                 "success": True,
                 "category": merchant_category,
                 "confidence": merchant_confidence,
@@ -4834,25 +5084,22 @@ def categorize_transaction(description: str, amount: float = 0) -> str:
                 "description": description,
                 "merchant": merchant_name,
                 "amount": amount
-            })
+            }
         
         # Fallback to keyword matching
         category = 'Other'
         confidence = 0.5
         
-        for cat, keywords in CATEGORY_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in desc_lower:
-                    category = cat
-                    confidence = 0.85
-                    break
-            if category != 'Other':
+        for cat, pattern in _CATEGORY_KEYWORD_PATTERNS:
+            if pattern.search(desc_lower):
+                category = cat
+                confidence = 0.85
                 break
         
         # Determine if income or expense based on category
         transaction_type = 'income' if category == 'Income' else 'expense'
         
-        return json.dumps({
+        return {
             "success": True,
             "category": category,
             "confidence": confidence,
@@ -4860,9 +5107,14 @@ def categorize_transaction(description: str, amount: float = 0) -> str:
             "description": description,
             "merchant": merchant_name,
             "amount": amount
-        })
+        }
     except Exception as e:
-        return json.dumps({"success": False, "error": str(e)})
+        return {"success": False, "error": str(e)}
+
+
+def categorize_transaction(description: str, amount: float = 0) -> str:
+    """Categorize a transaction based on description with enhanced merchant recognition."""
+    return json.dumps(_categorize_transaction_dict(description, amount))
 
 
 def categorize_transactions_batch(transactions_json: str) -> str:
@@ -4874,7 +5126,7 @@ def categorize_transactions_batch(transactions_json: str) -> str:
         for tx in transactions:
             desc = tx.get('description', '')
             amount = tx.get('amount', 0)
-            cat_result = json.loads(categorize_transaction(desc, amount))
+            cat_result = _categorize_transaction_dict(desc, amount)
             tx['category'] = cat_result.get('category', 'Other')
             tx['confidence'] = cat_result.get('confidence', 0.5)
             results.append(tx)
@@ -4971,6 +5223,43 @@ def analyze_spending_trends(transactions: list) -> str:
 analyze_spending = analyze_spending_trends
 
 
+# Advice tiers: (limit, status, message template, priority action).
+# The first tier whose limit the value falls under (or over, for debt) wins.
+_ADVICE_ICONS = {"Critical": "🚨", "Warning": "⚠️", "Good": "✅"}
+_EMERGENCY_FUND_TIERS = (
+    (3, "Critical", "You only have {:.1f} months of emergency coverage. Priority: Build to 3-6 months.",
+     "Build emergency fund to 3 months of expenses"),
+    (6, "Warning", "You have {:.1f} months coverage. Aim for 6 months.", None),
+    (math.inf, "Good", "Great! You have {:.1f} months of emergency coverage.", None),
+)
+_DEBT_TIERS = (
+    (40, "Critical", "Debt-to-income ratio is {:.1f}%. This is too high. Focus on debt reduction.",
+     "Reduce debt aggressively"),
+    (20, "Warning", "Debt-to-income ratio is {:.1f}%. Work on reducing this.", None),
+)
+_SAVINGS_RATE_TIERS = (
+    (10, "Critical", "Savings rate is only {:.1f}%. Cut expenses and increase savings.",
+     "Reduce expenses by 10-15%"),
+    (20, "Warning", "Savings rate is {:.1f}%. Try to reach 20-30%.", None),
+    (math.inf, "Good", "Excellent savings rate of {:.1f}%!", None),
+)
+
+
+def _append_tiered_advice(area, value, tiers, advice, priority_actions, above=False):
+    """Append the advice card (and priority action) for the first matching tier."""
+    for limit, status, template, action in tiers:
+        if (value > limit) if above else (value < limit):
+            advice.append({
+                "area": area,
+                "status": status,
+                "icon": _ADVICE_ICONS[status],
+                "message": template.format(value)
+            })
+            if action:
+                priority_actions.append(action)
+            return
+
+
 def get_financial_advice(
     income: float,
     expenses: float,
@@ -4980,81 +5269,20 @@ def get_financial_advice(
 ) -> str:
     """Generate personalized financial advice."""
     try:
-        savings_rate = ((income - expenses) / income * 100) if income > 0 else 0
+        monthly_surplus = income - expenses
+        savings_rate = (monthly_surplus / income * 100) if income > 0 else 0
         debt_to_income = (debt / (income * 12) * 100) if income > 0 else 0
         emergency_months = (savings / expenses) if expenses > 0 else 0
         
         advice = []
         priority_actions = []
         
-        # Emergency fund check
-        if emergency_months < 3:
-            advice.append({
-                "area": "Emergency Fund",
-                "status": "Critical",
-                "icon": "🚨",
-                "message": f"You only have {emergency_months:.1f} months of emergency coverage. Priority: Build to 3-6 months."
-            })
-            priority_actions.append("Build emergency fund to 3 months of expenses")
-        elif emergency_months < 6:
-            advice.append({
-                "area": "Emergency Fund",
-                "status": "Warning",
-                "icon": "⚠️",
-                "message": f"You have {emergency_months:.1f} months coverage. Aim for 6 months."
-            })
-        else:
-            advice.append({
-                "area": "Emergency Fund",
-                "status": "Good",
-                "icon": "✅",
-                "message": f"Great! You have {emergency_months:.1f} months of emergency coverage."
-            })
-        
-        # Debt check
+        _append_tiered_advice("Emergency Fund", emergency_months, _EMERGENCY_FUND_TIERS, advice, priority_actions)
         if debt > 0:
-            if debt_to_income > 40:
-                advice.append({
-                    "area": "Debt",
-                    "status": "Critical",
-                    "icon": "🚨",
-                    "message": f"Debt-to-income ratio is {debt_to_income:.1f}%. This is too high. Focus on debt reduction."
-                })
-                priority_actions.append("Reduce debt aggressively")
-            elif debt_to_income > 20:
-                advice.append({
-                    "area": "Debt",
-                    "status": "Warning",
-                    "icon": "⚠️",
-                    "message": f"Debt-to-income ratio is {debt_to_income:.1f}%. Work on reducing this."
-                })
-        
-        # Savings rate check
-        if savings_rate < 10:
-            advice.append({
-                "area": "Savings",
-                "status": "Critical",
-                "icon": "🚨",
-                "message": f"Savings rate is only {savings_rate:.1f}%. Cut expenses and increase savings."
-            })
-            priority_actions.append("Reduce expenses by 10-15%")
-        elif savings_rate < 20:
-            advice.append({
-                "area": "Savings",
-                "status": "Warning",
-                "icon": "⚠️",
-                "message": f"Savings rate is {savings_rate:.1f}%. Try to reach 20-30%."
-            })
-        else:
-            advice.append({
-                "area": "Savings",
-                "status": "Good",
-                "icon": "✅",
-                "message": f"Excellent savings rate of {savings_rate:.1f}%!"
-            })
+            _append_tiered_advice("Debt", debt_to_income, _DEBT_TIERS, advice, priority_actions, above=True)
+        _append_tiered_advice("Savings", savings_rate, _SAVINGS_RATE_TIERS, advice, priority_actions)
         
         # Investment suggestion based on surplus
-        monthly_surplus = income - expenses
         if monthly_surplus > 0:
             advice.append({
                 "area": "Investment",
@@ -5121,15 +5349,22 @@ def calculate_debt_payoff(debts: list, extra_payment: float = 0) -> str:
         avalanche_order = sorted(debts, key=lambda x: x.get('rate', 0), reverse=True)
         snowball_order = sorted(debts, key=lambda x: x.get('balance', 0))
         
-        total_debt = sum(d.get('balance', 0) for d in debts)
-        total_min_payment = sum(d.get('min_payment', 0) for d in debts)
+        # Single pass over the debts for all three totals
+        total_debt = 0
+        total_min_payment = 0
+        total_rate = 0
+        for d in debts:
+            total_debt += d.get('balance', 0)
+            total_min_payment += d.get('min_payment', 0)
+            total_rate += d.get('rate', 0)
         total_monthly = total_min_payment + extra_payment
         
         # Calculate months to payoff (simplified)
-        avg_rate = sum(d.get('rate', 0) for d in debts) / len(debts) if debts else 0
+        avg_rate = total_rate / len(debts) if debts else 0
+        monthly_rate = avg_rate / 1200  # Annual % -> monthly fraction, computed once
         if total_monthly > 0:
             months_to_payoff = math.ceil(total_debt / total_monthly) if avg_rate == 0 else \
-                math.ceil(math.log(total_monthly / (total_monthly - total_debt * avg_rate/1200)) / math.log(1 + avg_rate/1200))
+                math.ceil(math.log(total_monthly / (total_monthly - total_debt * monthly_rate)) / math.log1p(monthly_rate))
         else:
             months_to_payoff = float('inf')
         
@@ -5147,6 +5382,7 @@ def calculate_debt_payoff(debts: list, extra_payment: float = 0) -> str:
         return json.dumps({"success": False, "error": str(e)})
 
 
+@_memoize_calculator
 def project_net_worth(
     current_net_worth: float,
     monthly_savings: float,
@@ -5160,11 +5396,12 @@ def project_net_worth(
         
         for y in range(1, years + 1):
             months = y * 12
+            growth = (1 + monthly_rate) ** months
             # Future value of current net worth
-            fv_current = current_net_worth * ((1 + monthly_rate) ** months)
+            fv_current = current_net_worth * growth
             # Future value of monthly savings (annuity)
             if monthly_rate > 0:
-                fv_savings = monthly_savings * (((1 + monthly_rate) ** months - 1) / monthly_rate)
+                fv_savings = monthly_savings * ((growth - 1) / monthly_rate)
             else:
                 fv_savings = monthly_savings * months
             
@@ -5411,6 +5648,8 @@ def parse_bank_statement_text(text: str) -> str:
         
         lines = text.split('\n')
         last_date = None
+        # Fallback date for undated rows, computed once per statement
+        today = datetime.now().strftime('%Y-%m-%d')
         
         # Strategy 1: PhonePe multi-line block parsing
         # Format: Date -> Time -> DEBIT/CREDIT -> ₹Amount -> Description
@@ -5488,7 +5727,7 @@ def parse_bank_statement_text(text: str) -> str:
                         tx_desc = tx_desc.strip()[:60]
                         
                         # Get category
-                        cat_result = json.loads(categorize_transaction(tx_desc, tx_amount))
+                        cat_result = _categorize_transaction_dict(tx_desc, tx_amount)
                         
                         transactions.append({
                             'date': tx_date,
@@ -5564,10 +5803,10 @@ def parse_bank_statement_text(text: str) -> str:
                                 desc = 'Transaction'
                             
                             # Use the centralized categorization logic
-                            cat_result = json.loads(categorize_transaction(desc, amount))
+                            cat_result = _categorize_transaction_dict(desc, amount)
                             
                             transactions.append({
-                                'date': last_date or datetime.now().strftime('%Y-%m-%d'),
+                                'date': last_date or today,
                                 'description': desc,
                                 'amount': amount,
                                 'type': tx_type,
@@ -5611,25 +5850,6 @@ def parse_bank_statement_text(text: str) -> str:
 
 # ==================== HEALTH CHECK ====================
 
-def health_check() -> str:
-    """Check if Python backend is functioning."""
-    return json.dumps({
-        "success": True,
-        "status": "healthy",
-        "version": "2.0.0",
-        "python_version": "3.8",
-        "capabilities": [
-            "financial_calculations",
-            "transaction_categorization",
-            "spending_analytics",
-            "tax_calculations",
-            "debt_analysis",
-            "financial_advice"
-        ],
-        "tools_available": len(AVAILABLE_TOOLS)
-    })
-
-
 def init_python_backend() -> str:
     """Initialize the Python backend."""
     try: